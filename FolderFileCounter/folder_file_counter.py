@@ -1,4 +1,7 @@
+import asyncio
 import os
+import stat
+from functools import lru_cache
 
 from aiohttp import web
 import server
@@ -6,15 +9,26 @@ import server
 from allergic_utils import sanitize_path
 
 
+@lru_cache(maxsize=256)
+def _cached_count(folder_path, mtime_ns):
+    """Count regular files for a (path, directory mtime) pair.
+
+    The directory mtime changes whenever an entry is added or removed,
+    so a new mtime naturally misses the cache. Raises OSError on failure.
+    """
+    with os.scandir(folder_path) as entries:
+        return sum(1 for entry in entries if entry.is_file())
+
+
 def count_files(folder_path):
     """Count regular files in a directory. Returns 0 on error or invalid path."""
-    if not folder_path or not os.path.isdir(folder_path):
+    if not folder_path:
         return 0
     try:
-        return sum(
-            1 for entry in os.listdir(folder_path)
-            if os.path.isfile(os.path.join(folder_path, entry))
-        )
+        st = os.stat(folder_path)
+        if not stat.S_ISDIR(st.st_mode):
+            return 0
+        return _cached_count(os.path.abspath(folder_path), st.st_mtime_ns)
     except OSError:
         return 0
 
@@ -25,7 +39,9 @@ async def folder_file_count_route(request):
     data = await request.json()
     folder_path = data.get("folder_path", "")
     sanitized = sanitize_path(folder_path).strip()
-    return web.json_response({"file_count": count_files(sanitized)})
+    # Directory scans can stall on network drives; keep them off the event loop
+    file_count = await asyncio.to_thread(count_files, sanitized)
+    return web.json_response({"file_count": file_count})
 
 
 class FolderFileCounter:
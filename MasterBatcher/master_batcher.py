@@ -7,8 +7,11 @@ them batch by batch, outputting the correct folder path with every batch.
 """
 
 import os
+import hashlib
 import math
 import random
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
 import numpy as np
 import torch
@@ -18,7 +21,9 @@ import server
 from allergic_utils import sanitize_path
 
 
-IMAGE_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.bmp', '.tiff', '.tif', '.webp'}
+IMAGE_EXTENSIONS = frozenset({'.png', '.jpg', '.jpeg', '.bmp', '.tiff', '.tif', '.webp'})
+# Tuple form for str.endswith, which checks every suffix in a single C call
+IMAGE_EXT_TUPLE = tuple(IMAGE_EXTENSIONS)
 
 SORT_METHODS = [
     "alphabetical",
@@ -30,6 +35,58 @@ SORT_METHODS = [
     "random",
 ]
 
+# uint8 -> [0, 1] scale; multiplying by the reciprocal is cheaper than dividing
+_INV_255 = np.float32(1.0 / 255.0)
+
+_EXIF_ORIENTATION = 0x0112
+
+
+def _folder_mtime_ns(folder_path):
+    """Return a folder's mtime in nanoseconds, or None if it cannot be read."""
+    try:
+        return os.stat(folder_path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _open_image(filepath, target_size=None):
+    """Open an image with EXIF rotation applied.
+
+    If target_size (width, height) is given, JPEGs are decoded at the smallest
+    libjpeg scale that is still at least that size, so large photos that get
+    resized afterwards skip most of the full-resolution decode.
+    Returns (rgb_image, alpha_image); alpha_image is None without an alpha band.
+    """
+    img = Image.open(filepath)
+    if target_size is not None and img.format == "JPEG":
+        # draft() works on stored pixels, before EXIF rotation swaps the axes
+        width, height = target_size
+        if img.getexif().get(_EXIF_ORIENTATION, 1) in (5, 6, 7, 8):
+            width, height = height, width
+        img.draft(None, (width, height))
+    img = ImageOps.exif_transpose(img)
+
+    # Extract alpha channel before converting to RGB
+    alpha_img = img.getchannel('A') if 'A' in img.getbands() else None
+    return img.convert("RGB"), alpha_img
+
+
+def _write_slot(img_rgb, alpha_img, size, image_out, mask_out):
+    """Resize to size if needed and write float32 pixels and mask into one batch slot."""
+    if img_rgb.size != size:
+        img_rgb = img_rgb.resize(size, Image.LANCZOS)
+        if alpha_img is not None:
+            alpha_img = alpha_img.resize(size, Image.LANCZOS)
+
+    np.multiply(np.asarray(img_rgb), _INV_255, out=image_out)
+
+    # Build mask (ComfyUI convention: transparent=1, opaque=0)
+    if alpha_img is not None:
+        np.multiply(np.asarray(alpha_img), _INV_255, out=mask_out)
+        np.subtract(1.0, mask_out, out=mask_out)
+    else:
+        mask_out.fill(0.0)
+
 
 class MasterBatcher:
     """Batched image loader that processes multiple folders sequentially.
@@ -91,75 +148,107 @@ class MasterBatcher:
 
     @classmethod
     def IS_CHANGED(cls, **kwargs):
-        """Bypass caching when load_always is True."""
+        """Bypass caching when load_always is True.
+
+        Otherwise return a signature of the listed folders' mtimes, so cached
+        results are reused until files are added, removed or renamed.
+        Widget values are already part of ComfyUI's cache key.
+        """
         if kwargs.get("load_always", True):
             return float("NaN")
-        return ""
+
+        folders = cls.parse_folder_paths(kwargs.get("folder_paths", ""))
+        signature = [(folder_path, _folder_mtime_ns(folder_path)) for folder_path in folders]
+        return hashlib.sha256(repr(signature).encode("utf-8")).hexdigest()
 
     def get_image_files(self, folder_path, sort_method):
         """List and sort image files in a folder.
 
         Returns a list of filenames (not full paths) matching IMAGE_EXTENSIONS.
+        Raises OSError if folder_path is missing, not a directory, or unreadable.
         """
-        try:
-            entries = os.listdir(folder_path)
-        except OSError as e:
-            print(f"[MasterBatcher] Error listing folder '{folder_path}': {e}")
-            return []
-
         image_files = []
-        for entry in entries:
-            ext = os.path.splitext(entry)[1].lower()
-            if ext in IMAGE_EXTENSIONS:
-                full_path = os.path.join(folder_path, entry)
-                if os.path.isfile(full_path):
+        with os.scandir(folder_path) as it:
+            for entry in it:
+                if entry.name.lower().endswith(IMAGE_EXT_TUPLE) and entry.is_file():
                     image_files.append(entry)
 
+        # DirEntry.stat() is cached per entry, so time-based sorts stat each file once
         if sort_method == "alphabetical":
-            image_files.sort(key=lambda f: f.lower())
+            image_files.sort(key=lambda e: e.name.lower())
         elif sort_method == "alphabetical_reverse":
-            image_files.sort(key=lambda f: f.lower(), reverse=True)
+            image_files.sort(key=lambda e: e.name.lower(), reverse=True)
         elif sort_method == "modified_newest":
-            image_files.sort(
-                key=lambda f: os.path.getmtime(os.path.join(folder_path, f)),
-                reverse=True,
-            )
+            image_files.sort(key=lambda e: e.stat().st_mtime, reverse=True)
         elif sort_method == "modified_oldest":
-            image_files.sort(
-                key=lambda f: os.path.getmtime(os.path.join(folder_path, f)),
-            )
+            image_files.sort(key=lambda e: e.stat().st_mtime)
         elif sort_method == "created_newest":
-            image_files.sort(
-                key=lambda f: os.path.getctime(os.path.join(folder_path, f)),
-                reverse=True,
-            )
+            image_files.sort(key=lambda e: e.stat().st_ctime, reverse=True)
         elif sort_method == "created_oldest":
-            image_files.sort(
-                key=lambda f: os.path.getctime(os.path.join(folder_path, f)),
-            )
+            image_files.sort(key=lambda e: e.stat().st_ctime)
         elif sort_method == "random":
             random.shuffle(image_files)
 
-        return image_files
+        return [entry.name for entry in image_files]
+
+    @staticmethod
+    def parse_folder_paths(folder_paths_raw):
+        """Split the multi-line input into a tuple of sanitized, non-empty paths."""
+        return tuple(
+            folder_path for folder_path in
+            (sanitize_path(line) for line in folder_paths_raw.strip().split('\n'))
+            if folder_path
+        )
+
+    def count_image_files(self, folder_path):
+        """Count image files in a folder without building or sorting a list.
+
+        Raises OSError if folder_path is missing, not a directory, or unreadable.
+        """
+        with os.scandir(folder_path) as it:
+            return sum(
+                1 for entry in it
+                if entry.name.lower().endswith(IMAGE_EXT_TUPLE) and entry.is_file()
+            )
 
     def build_batch_map(self, folder_paths_raw, batch_size, sort_method):
         """Parse folder paths and build a list of batch descriptors.
 
         Each entry maps a batch_index to its folder and the filenames to load.
         Returns list of dicts: [{"folder_path": str, "files": [str, ...]}, ...]
+
+        Results are cached until a listed folder's mtime changes (files
+        added, removed or renamed). Random order is never cached.
         """
+        folders = self.parse_folder_paths(folder_paths_raw)
+
+        if sort_method == "random":
+            return self._scan_batch_map(folders, batch_size, sort_method)
+
+        signature = tuple(_folder_mtime_ns(folder_path) for folder_path in folders)
+        return self._cached_batch_map(folders, batch_size, sort_method, signature)
+
+    @classmethod
+    @lru_cache(maxsize=8)
+    def _cached_batch_map(cls, folders, batch_size, sort_method, signature):
+        """Memoized _scan_batch_map; signature only serves as the cache key."""
+        return cls()._scan_batch_map(folders, batch_size, sort_method)
+
+    def _scan_batch_map(self, folders, batch_size, sort_method):
+        """List each folder and slice its image files into batch descriptors."""
         batch_map = []
-        lines = folder_paths_raw.strip().split('\n')
 
-        for line in lines:
-            folder_path = sanitize_path(line)
-            if not folder_path:
-                continue
-            if not os.path.isdir(folder_path):
+        for folder_path in folders:
+            # scandir does the directory check itself, so no separate isdir() stat
+            try:
+                image_files = self.get_image_files(folder_path, sort_method)
+            except (FileNotFoundError, NotADirectoryError):
                 print(f"[MasterBatcher] Warning: '{folder_path}' is not a valid directory, skipping")
                 continue
+            except OSError as e:
+                print(f"[MasterBatcher] Error listing folder '{folder_path}': {e}")
+                continue
 
-            image_files = self.get_image_files(folder_path, sort_method)
             if not image_files:
                 print(f"[MasterBatcher] Warning: No image files found in '{folder_path}', skipping")
                 continue
@@ -207,51 +296,46 @@ class MasterBatcher:
         current_folder = descriptor["folder_path"]
         filenames = descriptor["files"]
 
-        images = []
-        masks = []
-        first_size = None
+        filepaths = [os.path.join(current_folder, filename) for filename in filenames]
+        loaded = []  # batch slots that decoded successfully, in file order
 
-        for filename in filenames:
-            filepath = os.path.join(current_folder, filename)
+        # Decode sequentially until one image succeeds; its size sets the batch shape
+        for slot, filepath in enumerate(filepaths):
             try:
-                img = Image.open(filepath)
-                img = ImageOps.exif_transpose(img)
-
-                # Extract alpha channel before converting to RGB
-                has_alpha = 'A' in img.getbands()
-                if has_alpha:
-                    alpha = np.array(img.getchannel('A')).astype(np.float32) / 255.0
-
-                img_rgb = img.convert("RGB")
-
-                # Resize to match first image dimensions
-                if first_size is None:
-                    first_size = img_rgb.size  # (width, height)
-                elif img_rgb.size != first_size:
-                    img_rgb = img_rgb.resize(first_size, Image.LANCZOS)
-                    if has_alpha:
-                        alpha_img = Image.fromarray((alpha * 255).astype(np.uint8))
-                        alpha_img = alpha_img.resize(first_size, Image.LANCZOS)
-                        alpha = np.array(alpha_img).astype(np.float32) / 255.0
-
-                # Convert to numpy float32
-                img_np = np.array(img_rgb).astype(np.float32) / 255.0
-                images.append(img_np)
-
-                # Build mask (ComfyUI convention: transparent=1, opaque=0)
-                if has_alpha:
-                    mask = 1.0 - alpha
-                else:
-                    h, w = img_np.shape[:2]
-                    mask = np.zeros((h, w), dtype=np.float32)
-                masks.append(mask)
-
+                img_rgb, alpha_img = _open_image(filepath)
+                first_size = img_rgb.size  # (width, height)
+                width, height = first_size
+                image_batch = np.empty((len(filepaths), height, width, 3), dtype=np.float32)
+                mask_batch = np.empty((len(filepaths), height, width), dtype=np.float32)
+                _write_slot(img_rgb, alpha_img, first_size, image_batch[slot], mask_batch[slot])
             except Exception as e:
                 print(f"[MasterBatcher] Warning: Failed to load '{filepath}': {e}")
                 continue
+            loaded.append(slot)
+            break
+
+        def decode_into_slot(slot):
+            try:
+                img_rgb, alpha_img = _open_image(filepaths[slot], first_size)
+                _write_slot(img_rgb, alpha_img, first_size, image_batch[slot], mask_batch[slot])
+                return True
+            except Exception as e:
+                print(f"[MasterBatcher] Warning: Failed to load '{filepaths[slot]}': {e}")
+                return False
+
+        # PIL releases the GIL while decoding and resizing, so threads overlap well
+        remaining = range(loaded[0] + 1, len(filepaths)) if loaded else range(0)
+        if remaining:
+            max_workers = min(len(remaining), os.cpu_count() or 1)
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                for slot, ok in zip(remaining, pool.map(decode_into_slot, remaining)):
+                    if ok:
+                        loaded.append(slot)
+
+        images_loaded = len(loaded)
 
         # If all files in the batch failed to load
-        if not images:
+        if images_loaded == 0:
             empty_image = torch.zeros(1, 1, 1, 3, dtype=torch.float32)
             empty_mask = torch.zeros(1, 1, 1, dtype=torch.float32)
             return {
@@ -266,10 +350,13 @@ class MasterBatcher:
                 "result": (empty_image, empty_mask, 0, current_folder, total_batches),
             }
 
-        # Stack into batch tensors
-        image_batch = torch.from_numpy(np.stack(images))  # (N, H, W, 3)
-        mask_batch = torch.from_numpy(np.stack(masks))    # (N, H, W)
-        images_loaded = len(images)
+        # Drop the slots of files that failed to load
+        if images_loaded < len(filepaths):
+            image_batch = image_batch[loaded]
+            mask_batch = mask_batch[loaded]
+
+        image_batch = torch.from_numpy(image_batch)  # (N, H, W, 3)
+        mask_batch = torch.from_numpy(mask_batch)    # (N, H, W)
 
         return {
             "ui": {
@@ -296,29 +383,32 @@ async def calculate_batches(request):
         data = await request.json()
         folder_paths_raw = data.get("folder_paths", "")
         batch_size = max(1, int(data.get("batch_size", 1)))
-        sort_method = data.get("sort_method", "alphabetical")
 
+        # Sort order does not affect counts, so skip sorting and building the batch list
         node = MasterBatcher()
-        batch_map = node.build_batch_map(folder_paths_raw, batch_size, sort_method)
-
-        # Build per-folder summary
         folder_batches = {}
-        for descriptor in batch_map:
-            fp = descriptor["folder_path"]
+        for fp in node.parse_folder_paths(folder_paths_raw):
+            try:
+                file_count = node.count_image_files(fp)
+            except OSError:
+                continue
+            if not file_count:
+                continue
             if fp not in folder_batches:
                 folder_batches[fp] = {
                     "folder_path": fp,
                     "file_count": 0,
                     "batch_count": 0,
                 }
-            folder_batches[fp]["batch_count"] += 1
-            folder_batches[fp]["file_count"] += len(descriptor["files"])
+            folder_batches[fp]["batch_count"] += math.ceil(file_count / batch_size)
+            folder_batches[fp]["file_count"] += file_count
 
         folders = list(folder_batches.values())
+        total_batches = sum(folder["batch_count"] for folder in folders)
 
         return server.web.json_response({
             "success": True,
-            "total_batches": len(batch_map),
+            "total_batches": total_batches,
             "folders": folders,
         })
     except Exception as e:
@@ -4,10 +4,9 @@ Captures and displays Python environment information including packages, CUDA, a
 Features change detection and a button for immediate population without workflow execution.
 """
 
-import torch
-import importlib.metadata
 import sys
 from datetime import datetime
+from functools import lru_cache
 import server
 
 
@@ -28,6 +27,9 @@ class RememberMeNode:
     CATEGORY = "Allergic Pack"
     OUTPUT_NODE = True
 
+    # Everything except the timestamp is fixed for the life of the process
+    _environment_details = None
+
     @staticmethod
     def _strip_local_version(version):
         """Strip PEP 440 local version identifier (everything after '+').
@@ -37,53 +39,81 @@ class RememberMeNode:
         """
         return version.split("+")[0] if version else version
 
-    def _get_package_version(self, import_names, pypi_keywords, display_name):
-        """Try to get package version by import or PyPI name."""
-        if not isinstance(import_names, list):
-            import_names = [import_names]
-        if not isinstance(pypi_keywords, list):
-            pypi_keywords = [pypi_keywords]
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _get_package_version(import_names, pypi_keywords, display_name):
+        """Try to get package version by PyPI name or import.
+
+        pypi_keywords are exact distribution names, looked up directly in the
+        metadata index (case and -/_ insensitive). Names may be a single
+        string or a tuple of strings (hashable, since results are memoized
+        per process).
+        """
+        # Deferred so loading the pack does not pay for importlib.metadata
+        import importlib
+        import importlib.metadata
+
+        if isinstance(import_names, str):
+            import_names = (import_names,)
+        if isinstance(pypi_keywords, str):
+            pypi_keywords = (pypi_keywords,)
+
+        # Try PyPI metadata first; importing e.g. xformers can initialize CUDA
+        for keyword in pypi_keywords:
+            try:
+                version = importlib.metadata.version(keyword)
+            except Exception:
+                continue
+            if version:
+                return f"{display_name}: {RememberMeNode._strip_local_version(version)}"
 
-        # Try importing first
+        # Fall back to importing for installs without dist-info metadata
         for import_name in import_names:
             try:
                 pkg = importlib.import_module(import_name)
                 version = getattr(pkg, '__version__', None)
                 if version:
-                    return f"{display_name}: {self._strip_local_version(version)}"
+                    return f"{display_name}: {RememberMeNode._strip_local_version(version)}"
             except (ImportError, Exception):
                 continue
 
-        # Try PyPI metadata
-        try:
-            for dist in importlib.metadata.distributions():
-                dist_name_lower = dist.name.lower()
-                for keyword in pypi_keywords:
-                    if keyword.lower() in dist_name_lower:
-                        return f"{display_name}: {self._strip_local_version(dist.version)}"
-        except Exception:
-            pass
-
         return f"{display_name}: Not Found"
 
-    def _generate_environment_snapshot(self):
-        """Generate human-readable environment snapshot"""
-        lines = []
-        
+    def _generate_environment_snapshot(self, now=None):
+        """Generate human-readable environment snapshot.
+
+        Returns (snapshot, comparison_key). The key is the snapshot minus its
+        'Captured:' line, which the frontend uses for change detection.
+        """
+        cls = type(self)
+        if cls._environment_details is None:
+            cls._environment_details = self._collect_environment_details()
+
+        # Blank line for readability between the timestamp and the details
+        body = "\n" + cls._environment_details
+
         # Timestamp
         try:
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            lines.append(f"Captured: {timestamp}")
+            timestamp = (now or datetime.now()).strftime("%Y-%m-%d %H:%M:%S")
+            header = f"Captured: {timestamp}"
+            comparison_key = body
         except Exception as e:
-            lines.append(f"Timestamp Error: {e}")
-        
-        lines.append("")  # Blank line for readability
-        
+            header = f"Timestamp Error: {e}"
+            comparison_key = header + "\n" + body
+
+        return header + "\n" + body, comparison_key
+
+    def _collect_environment_details(self):
+        """Collect versions, CUDA info and CLI args (everything but the timestamp)."""
+        lines = []
+
         # Python version
         lines.append(f"Python: {sys.version.split()[0]}")
         
         # PyTorch info
         try:
+            import torch  # Deferred until the node first runs
+
             pt_version = torch.__version__
             pytorch_line = f"PyTorch: {pt_version}"
             
@@ -105,30 +135,36 @@ class RememberMeNode:
             lines.append(f"PyTorch: Error - {str(e)[:50]}")
         
         # Key packages
-        lines.append(self._get_package_version(["triton"], ["triton"], "Triton"))
-        lines.append(self._get_package_version(["sage_attn", "sageattention"], ["sageattention", "sage-attn"], "Sage Attention"))
-        lines.append(self._get_package_version(["xformers"], ["xformers"], "xformers"))
+        lines.append(self._get_package_version(
+            ("triton",),
+            ("triton", "triton-windows", "pytorch-triton", "pytorch-triton-rocm"),
+            "Triton",
+        ))
+        lines.append(self._get_package_version(("sage_attn", "sageattention"), ("sageattention", "sage-attn"), "Sage Attention"))
+        lines.append(self._get_package_version(("xformers",), ("xformers",), "xformers"))
         
-        # Command line args (if interesting)
+        # Command line args (if interesting, i.e. any --flag present)
         try:
-            if len(sys.argv) > 1 and any(arg.startswith('--') for arg in sys.argv[1:]):
+            arg_lines = []
+            current_group = []
+            has_flags = False
+
+            for arg in sys.argv[1:]:
+                if arg.startswith("--"):
+                    has_flags = True
+                    if current_group:
+                        arg_lines.append(f"  {' '.join(current_group)}")
+                    current_group = [arg]
+                elif current_group:
+                    current_group.append(arg)
+                else:
+                    arg_lines.append(f"  {arg}")
+
+            if has_flags:
+                arg_lines.append(f"  {' '.join(current_group)}")
                 lines.append("")
                 lines.append("CLI Args:")
-                args = sys.argv[1:]
-                current_group = []
-                
-                for arg in args:
-                    if arg.startswith("--"):
-                        if current_group:
-                            lines.append(f"  {' '.join(current_group)}")
-                        current_group = [arg]
-                    elif current_group:
-                        current_group.append(arg)
-                    else:
-                        lines.append(f"  {arg}")
-                
-                if current_group:
-                    lines.append(f"  {' '.join(current_group)}")
+                lines.extend(arg_lines)
         except Exception as e:
             lines.append(f"CLI Args Error: {e}")
         
@@ -136,17 +172,14 @@ class RememberMeNode:
 
     def capture_environment(self, populate_env=None):
         """Capture current environment info and detect changes"""
-        current_snapshot = self._generate_environment_snapshot()
-        
-        # For change detection, we'll store a simplified version without timestamp
-        lines = current_snapshot.split('\n')
-        snapshot_without_timestamp = '\n'.join([line for line in lines if not line.startswith('Captured:')])
+        now = datetime.now()
+        current_snapshot, snapshot_without_timestamp = self._generate_environment_snapshot(now)
         
         # Create payload for JavaScript change detection and display
         payload = {
             "current_snapshot": current_snapshot,
             "comparison_key": snapshot_without_timestamp,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now.isoformat(),
             "populate_requested": populate_env is not None
         }
         
@@ -31,19 +31,26 @@ NODE_DISPLAY_NAME_MAPPINGS = {}
 # --- THIS IS THE DIRECTORY for JavaScript loading ---
 WEB_DIRECTORY = "js" 
 
+def _scan_entries(path):
+    """List a directory as DirEntry objects (is_dir/is_file reuse the directory read)."""
+    with os.scandir(path) as it:
+        return list(it)
+
 # Iterate over all items (files and directories) in the AllergicPack directory
-for node_folder_name in os.listdir(allergic_pack_dir):
-    node_folder_path = os.path.join(allergic_pack_dir, node_folder_name)
+for node_folder in _scan_entries(allergic_pack_dir):
+    node_folder_name = node_folder.name
+    node_folder_path = node_folder.path
 
     # Check if the item is a directory (this will be our node's specific subfolder)
     # Also, ignore the WEB_DIRECTORY folder itself and common non-node folders like .git, __pycache__
-    if os.path.isdir(node_folder_path) and node_folder_name != WEB_DIRECTORY and not node_folder_name.startswith(('.', '_')):
+    if node_folder_name != WEB_DIRECTORY and not node_folder_name.startswith(('.', '_')) and node_folder.is_dir():
         
-        for py_filename in os.listdir(node_folder_path):
+        for py_file in _scan_entries(node_folder_path):
+            py_filename = py_file.name
             # Ensure we are only processing .py files and not __init__.py from the subfolder itself
             if py_filename.endswith(".py") and py_filename != "__init__.py":
                 py_module_name_only = py_filename[:-3] # Remove .py extension
-                module_file_full_path = os.path.join(node_folder_path, py_filename)
+                module_file_full_path = py_file.path
 
                 try:
                     full_module_spec_name = f"{__name__}.{node_folder_name}.{py_module_name_only}"
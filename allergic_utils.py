@@ -3,6 +3,35 @@
 import re
 
 
+# Windows drive letter prefix with optional trailing backslash
+_DRIVE_RE = re.compile(r'^([A-Za-z]):\\?')
+
+# Characters actually forbidden in Windows filenames: < > " | ? *
+# (colon handled via drive prefix, slashes are separators), plus control
+# characters 0-31 and 127-159. Everything here is deleted in one pass.
+_FORBIDDEN_CHARS = '<>"|?*'
+_SANITIZE_TABLE = str.maketrans('', '', _FORBIDDEN_CHARS + ''.join(
+    chr(c) for c in list(range(0, 32)) + list(range(127, 160))
+))
+
+# Runs of spaces and of backslashes, collapsed in a single linear pass
+_MULTI_SPACE_RE = re.compile(r' {2,}')
+_MULTI_BACKSLASH_RE = re.compile(r'\\{2,}')
+
+# Paths sanitize_path would return unchanged: an optional "X:\" drive, then
+# backslash-separated components of allowed characters, where no component
+# ends in a dot or space and the path does not start or end with whitespace.
+# (Double spaces are checked separately.)
+_ALLOWED = r'[^\\/<>"|?*\x00-\x1f\x7f-\x9f]'
+_COMPONENT_END = r'[^\\/<>"|?*\x00-\x1f\x7f-\x9f. ]'
+_PATH_START = r'[^\\/<>"|?*\x00-\x1f\x7f-\x9f\s]'
+_PATH_END = r'[^\\/<>"|?*\x00-\x1f\x7f-\x9f.\s]'
+_CLEAN_PATH_RE = re.compile(
+    r'(?:[A-Za-z]:\\|(?![A-Za-z]:))'
+    rf'(?={_PATH_START})(?:{_ALLOWED}*{_COMPONENT_END}\\)*{_ALLOWED}*{_PATH_END}\Z'
+)
+
+
 def sanitize_path(path_str):
     """Clean filesystem-unfriendly characters from a path string.
 
@@ -19,9 +48,12 @@ def sanitize_path(path_str):
        (path_str.startswith("'") and path_str.endswith("'")):
         path_str = path_str[1:-1]
 
+    # Fast path: typical inputs are already clean and come back unchanged
+    if '  ' not in path_str and _CLEAN_PATH_RE.match(path_str):
+        return path_str
+
     # Preserve Windows drive letter (e.g. "D:\")
-    drive_pattern = r'^([A-Za-z]):\\?'
-    drive_match = re.match(drive_pattern, path_str)
+    drive_match = _DRIVE_RE.match(path_str)
     drive_prefix = ""
     remaining_path = path_str
 
@@ -29,28 +61,16 @@ def sanitize_path(path_str):
         drive_prefix = drive_match.group(1) + ":\\"
         remaining_path = path_str[len(drive_match.group(0)):]
 
-    # Remove characters actually forbidden in Windows filenames
-    # Only: < > " | ? * (colon handled via drive prefix, slashes are separators)
-    forbidden_chars = '<>"|?*'
-    sanitized = remaining_path
-    for char in forbidden_chars:
-        sanitized = sanitized.replace(char, '')
-
-    # Remove control characters (0-31 and 127-159)
-    sanitized = ''.join(
-        char for char in sanitized
-        if (ord(char) > 31 and ord(char) < 127) or ord(char) > 159
-    )
+    # Remove forbidden filename characters and control characters
+    sanitized = remaining_path.translate(_SANITIZE_TABLE)
 
     # Collapse multiple spaces
-    while '  ' in sanitized:
-        sanitized = sanitized.replace('  ', ' ')
+    sanitized = _MULTI_SPACE_RE.sub(' ', sanitized)
     sanitized = sanitized.strip()
 
     # Normalize to backslashes and collapse duplicates
     sanitized = sanitized.replace('/', '\\')
-    while '\\\\' in sanitized:
-        sanitized = sanitized.replace('\\\\', '\\')
+    sanitized = _MULTI_BACKSLASH_RE.sub(r'\\', sanitized)
 
     # Remove trailing dots and spaces from each path component
     path_parts = sanitized.split('\\')